@@ -12,7 +12,7 @@ from pathlib import Path
 # Add the current directory to the path so we can import from travel_demo
 sys.path.insert(0, str(Path(__file__).parent))
 
-from travel_demo import RAGComparison, TravelPlanner, load_travel_data
+from travel_demo import RAGComparison, TravelPlanner, load_travel_data, get_embedding_model
 
 def main():
     print("🌟" * 30)
@@ -45,7 +45,15 @@ def main():
         "Orlando theme parks for families"
     ]
 
-    rag = RAGComparison(docs)
+    # One embedding model shared by the RAG comparison and the planner; the
+    # demo's corpora are tiny, so it runs on the CPU
+    try:
+        embedder = get_embedding_model(device="cpu")
+    except Exception:
+        # Missing package or model download failure; each component reports it on use
+        embedder = None
+
+    rag = RAGComparison(docs, embedder=embedder)
     query = "cheap food in San Francisco"
 
     print(f"\n🔎 Query: '{query}'\n")
@@ -77,7 +85,7 @@ def main():
     print("="*60)
 
     # Create a sample travel plan
-    planner = TravelPlanner(data)
+    planner = TravelPlanner(data, embedder=embedder)
 
     # Check available cities
     available_cities = sorted(data.flights['origin'].unique())
@@ -11,10 +11,12 @@ Usage: python travel_demo.py
 """
 
 from __future__ import annotations
+import hashlib
 import os
 import re
 import sys
-from dataclasses import dataclass
+from collections import Counter
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Tuple, Union
 import random
@@ -29,6 +31,13 @@ try:
 except ImportError:
     print("python-dotenv not installed. Environment variables may not be loaded.")
 
+# Optional stemmer for lexical search
+try:
+    import Stemmer
+    _STEMMER = Stemmer.Stemmer("english")
+except ImportError:
+    _STEMMER = None
+
 # Set random seeds for reproducibility
 random.seed(7)
 np.random.seed(7)
@@ -36,47 +45,205 @@ np.random.seed(7)
 # Data directory
 DATA_DIR = Path(__file__).parent / "data"
 
+# Embeddings saved between runs
+EMB_CACHE_DIR = Path(__file__).parent / ".emb_cache"
+
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+# Embedding models by name, loaded on first use so torch is only imported when needed
+_st_cache: Dict[str, Any] = {}
+
+def get_embedding_model(name: str = EMBEDDING_MODEL, device: Optional[str] = None):
+    """
+    Return the shared SentenceTransformer for name, loading it on first call.
+    `device` only applies to that first load (None lets sentence-transformers
+    pick, i.e. CUDA when available); small corpora encode faster on "cpu" than
+    with a round trip through the GPU.
+    """
+    if name not in _st_cache:
+        import torch
+        if "OMP_NUM_THREADS" not in os.environ:
+            torch.set_num_threads(os.cpu_count() or 4)
+        from sentence_transformers import SentenceTransformer
+        _st_cache[name] = SentenceTransformer(name, device=device)
+    return _st_cache[name]
+
+def _emb_cache_path(model, texts: List[str]) -> Optional[Path]:
+    """Cache file for model's embeddings of texts, keyed by model name and content
+
+    Only models loaded by get_embedding_model have a known name; for any other
+    embedder this returns None and embeddings are not cached on disk.
+    """
+    name = next((n for n, m in _st_cache.items() if m is model), None)
+    if name is None:
+        return None
+    key = hashlib.sha1("\n".join([name, *texts]).encode("utf-8")).hexdigest()[:16]
+    return EMB_CACHE_DIR / f"{key}.npy"
+
+def _load_emb(path: Optional[Path]) -> Optional[np.ndarray]:
+    """Cached embeddings at path, or None if there are none; an unreadable file is deleted"""
+    if path is None:
+        return None
+    try:
+        return np.load(path, mmap_mode="r")
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, EOFError) as e:
+        print(f"Discarding unreadable embedding cache {path.name}: {e}")
+        path.unlink(missing_ok=True)
+        return None
+
+def _save_emb(path: Path, emb: np.ndarray) -> None:
+    """Write embeddings to the cache; a failed write only costs a re-encode"""
+    # Write a temporary file and rename it over path, so readers never see a partial file
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(exist_ok=True)
+        with open(tmp, "wb") as f:
+            np.save(f, emb)
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"Could not cache embeddings: {e}")
+        tmp.unlink(missing_ok=True)
+
+_WORD_RE = re.compile(r"\w+")
+
+_STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is",
+    "it", "near", "of", "on", "or", "the", "to", "with",
+})
+
+def _tokenize(text: str) -> List[str]:
+    """Lowercase word tokens with stopwords removed, stemmed if PyStemmer is installed"""
+    tokens = [t for t in _WORD_RE.findall(text.lower()) if t not in _STOPWORDS]
+    return _STEMMER.stemWords(tokens) if _STEMMER is not None else tokens
+
+def _topk(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores along the last axis, best first"""
+    k = min(k, scores.shape[-1])
+    if k <= 0:
+        return np.empty(scores.shape[:-1] + (0,), dtype=np.intp)
+    idx = np.argpartition(-scores, k - 1, axis=-1)[..., :k]
+    order = np.argsort(-np.take_along_axis(scores, idx, axis=-1), axis=-1)
+    return np.take_along_axis(idx, order, axis=-1)
+
 @dataclass
 class TravelData:
-    """Container for travel data"""
+    """Container for travel data, with the lookups plan_trip needs derived on construction"""
     activities: pd.DataFrame
     hotels: pd.DataFrame
     flights: pd.DataFrame
+    # Lookups precomputed once in __post_init__
+    cheapest_flight_by_route: Dict[Tuple[str, str], pd.Series] = field(init=False)
+    hotels_by_city: Dict[str, pd.DataFrame] = field(init=False)  # best-rated first
+    activities_by_city: Dict[str, pd.DataFrame] = field(init=False)
+    # Activity columns as flat arrays, aligned with activities row positions
+    activity_city: np.ndarray = field(init=False)
+    activity_theme: np.ndarray = field(init=False)
+    activity_cost: np.ndarray = field(init=False)
+    activity_score: Optional[np.ndarray] = field(init=False)  # None without a review_score column
+    # Fields printed in a plan, as a record array for per-row access without Series
+    activity_records: np.recarray = field(init=False)
+
+    def __post_init__(self):
+        # City and theme are matched by categorical code
+        plain = [col for col in ('city', 'theme')
+                 if not isinstance(self.activities[col].dtype, pd.CategoricalDtype)]
+        if plain:
+            self.activities = self.activities.astype({col: 'category' for col in plain})
+        activities, hotels, flights = self.activities, self.hotels, self.flights
+
+        cheapest_idx = flights.groupby(['origin', 'destination'], observed=True)['price_usd'].idxmin()
+        self.cheapest_flight_by_route = {
+            (flight['origin'], flight['destination']): flight
+            for _, flight in flights.loc[cheapest_idx].iterrows()
+        }
+        self.hotels_by_city = dict(tuple(
+            hotels.sort_values('review_score', ascending=False, kind='stable').groupby('city', observed=True)
+        ))
+        self.activities_by_city = dict(tuple(activities.groupby('city', observed=True)))
+        self.activity_city = activities['city'].cat.codes.to_numpy(np.int16)
+        self.activity_theme = activities['theme'].cat.codes.to_numpy(np.int16)
+        self.activity_cost = activities['cost_usd'].to_numpy(np.float32)
+        self.activity_score = (activities['review_score'].to_numpy(np.float32)
+                               if 'review_score' in activities.columns else None)
+        self.activity_records = activities[
+            ['name', 'theme', 'duration_hours', 'cost_usd', 'opening_hours', 'notes']
+        ].to_records(index=False)
 
 class RAGComparison:
     """Demonstrates different RAG approaches for travel search"""
 
-    def __init__(self, docs: List[str]):
+    def __init__(self, docs: List[str], embedder=None):
         self.docs = docs
+        # Optional SentenceTransformer to share with other components; defaults to the module model
+        self.embedder = embedder
+        # Term frequencies as sparse (doc, token id, count) triples for exact keyword matching
+        self._vocab: Dict[str, int] = {}
+        tf_doc, tf_token, tf_count = [], [], []
+        for i, doc in enumerate(docs):
+            for token, count in Counter(_tokenize(doc)).items():
+                tf_doc.append(i)
+                tf_token.append(self._vocab.setdefault(token, len(self._vocab)))
+                tf_count.append(count)
+        self._tf_doc = np.array(tf_doc, dtype=np.int32)
+        self._tf_token = np.array(tf_token, dtype=np.int32)
+        self._tf_count = np.array(tf_count, dtype=np.float64)
+        # Document embeddings, reused across queries while self.docs is unchanged
+        self._doc_emb = None
+        self._doc_emb_key = None
+        # BM25 index, built on first bm25_rank call
+        self._bm25 = None
 
     def exact_keyword_match(self, query: str, k: int = 5) -> List[Tuple[float, str]]:
         """
         Exact keyword matching: count occurrences of query tokens in each doc.
-        Score = sum of term frequencies for exact tokens (case-insensitive).
+        Score = sum of term frequencies for query tokens (case-insensitive,
+        stopwords removed, stemmed when PyStemmer is installed).
         """
-        q_tokens = re.findall(r"\w+", query.lower())
-        scores = []
-        for doc in self.docs:
-            d_tokens = re.findall(r"\w+", doc.lower())
-            score = sum(d_tokens.count(token) for token in q_tokens)
-            if score > 0:
-                scores.append((float(score), doc))
-        scores.sort(key=lambda x: x[0], reverse=True)
-        return scores[:k]
-
-    def bm25_rank(self, query: str, k: int = 5) -> List[Tuple[float, str]]:
-        """BM25 ranking with rank-bm25"""
+        q_ids = [self._vocab[token] for token in _tokenize(query) if token in self._vocab]
+        if not q_ids:
+            return []
+        # Weight each indexed term by how often it appears in the query, then sum per doc
+        q_weight = np.bincount(q_ids, minlength=len(self._vocab))
+        scores = np.bincount(self._tf_doc, weights=self._tf_count * q_weight[self._tf_token],
+                             minlength=len(self.docs))
+        hits = np.flatnonzero(scores > 0)
+        order = hits[np.argsort(-scores[hits], kind="stable")][:k]
+        return [(float(scores[i]), self.docs[i]) for i in order]
+
+    def _build_bm25(self):
+        """Index self.docs with bm25s, falling back to rank-bm25"""
         try:
-            from rank_bm25 import BM25Okapi
+            import bm25s
         except ImportError:
-            print("rank-bm25 not installed. Install with: pip install rank-bm25")
-            return []
+            try:
+                from rank_bm25 import BM25Okapi
+            except ImportError:
+                print("bm25s not installed. Install with: pip install bm25s")
+                return None
+            return BM25Okapi([_tokenize(doc) for doc in self.docs])
+
+        retriever = bm25s.BM25()
+        retriever.index(bm25s.tokenize(self.docs, stopwords="en", stemmer=_STEMMER, show_progress=False), show_progress=False)
+        return retriever
 
-        tokenized_corpus = [re.findall(r"\w+", doc.lower()) for doc in self.docs]
-        bm25 = BM25Okapi(tokenized_corpus)
-        q_tokens = re.findall(r"\w+", query.lower())
-        scores = bm25.get_scores(q_tokens)
-        order = np.argsort(scores)[::-1][:k]
+    def bm25_rank(self, query: str, k: int = 5) -> List[Tuple[float, str]]:
+        """BM25 ranking with bm25s (or rank-bm25 if bm25s is unavailable)"""
+        if self._bm25 is None:
+            self._bm25 = self._build_bm25()
+            if self._bm25 is None:
+                return []
+
+        if hasattr(self._bm25, "retrieve"):
+            import bm25s
+            q_tokens = bm25s.tokenize([query], stopwords="en", stemmer=_STEMMER, show_progress=False)
+            ids, scores = self._bm25.retrieve(q_tokens, k=min(k, len(self.docs)), show_progress=False)
+            return [(float(score), self.docs[i]) for i, score in zip(ids[0], scores[0]) if score > 0]
+
+        q_tokens = _tokenize(query)
+        scores = self._bm25.get_scores(q_tokens)
+        order = _topk(scores, k)
         return [(float(scores[i]), self.docs[i]) for i in order if scores[i] > 0]
 
     def embedding_rank(self, query: str, k: int = 5) -> List[Tuple[float, str]]:
@@ -85,17 +252,35 @@ class RAGComparison:
         Falls back gracefully if package isn't installed.
         """
         try:
-            from sentence_transformers import SentenceTransformer, util
+            model = self.embedder if self.embedder is not None else get_embedding_model()
         except ImportError:
             print("sentence-transformers not installed. Install with: pip install sentence-transformers")
             return []
+        except Exception as e:
+            # e.g. an OSError when the model cannot be downloaded or loaded
+            print(f"Error with embeddings: {e}")
+            return []
 
         try:
-            model = SentenceTransformer("all-MiniLM-L6-v2")
-            doc_emb = model.encode(self.docs, convert_to_tensor=True, normalize_embeddings=True)
-            q_emb = model.encode([query], convert_to_tensor=True, normalize_embeddings=True)[0]
-            cos = (doc_emb @ q_emb).cpu().numpy()
-            order = np.argsort(cos)[::-1][:k]
+            q_emb = None
+            if self._doc_emb is None or self._doc_emb_key != id(self.docs):
+                cache_path = _emb_cache_path(model, self.docs)
+                # The disk cache holds half precision; upcast once here rather than per query
+                cached = _load_emb(cache_path)
+                if cached is not None:
+                    self._doc_emb = np.array(cached, dtype=np.float32)
+                else:
+                    # Encode query and docs in one batch (encode() already length-sorts inputs)
+                    all_emb = model.encode([query] + self.docs, batch_size=min(64, len(self.docs) + 1),
+                                           convert_to_numpy=True, normalize_embeddings=True)
+                    q_emb, self._doc_emb = all_emb[0], all_emb[1:]
+                    if cache_path is not None:
+                        _save_emb(cache_path, self._doc_emb.astype(np.float16))
+                self._doc_emb_key = id(self.docs)
+            if q_emb is None:
+                q_emb = model.encode([query], convert_to_numpy=True, normalize_embeddings=True)[0]
+            cos = self._doc_emb @ q_emb
+            order = _topk(cos, k)
             return [(float(cos[i]), self.docs[i]) for i in order]
         except Exception as e:
             print(f"Error with embeddings: {e}")
@@ -104,41 +289,50 @@ class RAGComparison:
 class TravelPlanner:
     """RAG-based travel planner"""
 
-    def __init__(self, travel_data: TravelData):
+    def __init__(self, travel_data: TravelData, embedder=None):
         self.data = travel_data
+        # Optional SentenceTransformer to share with other components; defaults to the module model
+        self.embedder = embedder
 
     def get_semantic_themes(self, themes: List[str], destination: str) -> List[str]:
         """Use embeddings to find semantically similar themes"""
         try:
-            from sentence_transformers import SentenceTransformer
-            model = SentenceTransformer("all-MiniLM-L6-v2")
+            model = self.embedder if self.embedder is not None else get_embedding_model()
         except ImportError:
             print("Using exact theme matching (sentence-transformers not available)")
             return themes
+        except Exception as e:
+            print(f"Using exact theme matching (could not load embedding model: {e})")
+            return themes
 
-        available_themes = self.data.activities.loc[
-            self.data.activities['city'] == destination, 'theme'
-        ].unique().tolist()
+        city_activities = self.data.activities_by_city.get(destination)
+        available_themes = [] if city_activities is None else sorted(city_activities['theme'].unique())
 
         if not available_themes:
             return themes
 
         close_themes = set()
-        for theme in themes:
-            try:
-                # Find semantically similar themes
-                theme_embeddings = model.encode(available_themes, normalize_embeddings=True)
-                query_embedding = model.encode([theme], normalize_embeddings=True)[0]
-                similarities = (theme_embeddings @ query_embedding)
-
-                # Get top 3 most similar themes
-                top_indices = np.argsort(similarities)[::-1][:3]
-                top_themes = [available_themes[i] for i in top_indices if similarities[i] > 0.3]
-                close_themes.update(top_themes)
-                print(f"Theme '{theme}' expanded to: {top_themes}")
-            except Exception as e:
-                print(f"Error processing theme '{theme}': {e}")
-                close_themes.add(theme)
+        try:
+            # Encode the candidate themes once and all query themes in one batch
+            cache_path = _emb_cache_path(model, available_themes)
+            theme_embeddings = _load_emb(cache_path)
+            if theme_embeddings is None:
+                theme_embeddings = model.encode(available_themes, normalize_embeddings=True, convert_to_numpy=True)
+                if cache_path is not None:
+                    _save_emb(cache_path, theme_embeddings)
+            query_embeddings = model.encode(themes, normalize_embeddings=True, convert_to_numpy=True)
+            similarities = query_embeddings @ theme_embeddings.T
+        except Exception as e:
+            print(f"Error processing themes {themes}: {e}")
+            return themes
+
+        # Top 3 most similar available themes for every query theme at once
+        top_indices = _topk(similarities, 3)
+        top_sims = np.take_along_axis(similarities, top_indices, axis=1)
+        for theme, indices, sims in zip(themes, top_indices, top_sims):
+            top_themes = [available_themes[i] for i, sim in zip(indices, sims) if sim > 0.3]
+            close_themes.update(top_themes)
+            print(f"Theme '{theme}' expanded to: {top_themes}")
 
         return list(close_themes)
 
@@ -147,42 +341,48 @@ class TravelPlanner:
         """Generate a travel plan using RAG"""
 
         # Retrieve relevant data
-        flights = self.data.flights[
-            (self.data.flights['origin'] == origin) &
-            (self.data.flights['destination'] == destination)
-        ]
-
-        hotels = self.data.hotels[self.data.hotels['city'] == destination]
+        cheapest_flight = self.data.cheapest_flight_by_route.get((origin, destination))
+        hotels = self.data.hotels_by_city.get(destination, self.data.hotels.iloc[:0])
 
         # Use semantic theme matching
         expanded_themes = self.get_semantic_themes(themes, destination)
-        activities = self.data.activities[
-            (self.data.activities['city'] == destination) &
-            (self.data.activities['theme'].isin(expanded_themes))
-        ]
+        dest_code = self.data.activities['city'].cat.categories.get_indexer([destination])[0]
+        theme_codes = self.data.activities['theme'].cat.categories.get_indexer(expanded_themes)
+        if dest_code < 0:
+            # Unknown city; its code -1 would otherwise match activities with a missing city
+            activity_idx = np.empty(0, dtype=np.intp)
+        else:
+            activity_idx = np.flatnonzero(
+                (self.data.activity_city == dest_code) &
+                np.isin(self.data.activity_theme, theme_codes[theme_codes >= 0])
+            )
 
-        if flights.empty:
+        if cheapest_flight is None:
             return f"No flights found from {origin} to {destination}"
         if hotels.empty:
             return f"No hotels found in {destination}"
-        if activities.empty:
+        if activity_idx.size == 0:
             return f"No activities found in {destination} for themes: {themes}"
 
         # Simple planning logic (in a real app, this would use LLM)
-        cheapest_flight = flights.loc[flights['price_usd'].idxmin()]
         budget_hotels = hotels[hotels['nightly_price_usd'] <= budget / 5]  # Assume 5 nights max
-        budget_activities = activities[activities['cost_usd'] <= budget / 10]  # Budget constraint
+        budget_idx = activity_idx[self.data.activity_cost[activity_idx] <= budget / 10]  # Budget constraint
 
         if budget_hotels.empty:
-            budget_hotels = hotels.nsmallest(3, 'nightly_price_usd')
-        if budget_activities.empty:
-            budget_activities = activities.nsmallest(5, 'cost_usd')
+            # Best rated of the three cheapest, ties broken by original row order
+            budget_hotels = hotels.sort_index().nsmallest(3, 'nightly_price_usd')
+            best_hotel = budget_hotels.loc[budget_hotels['review_score'].idxmax()]
+        else:
+            best_hotel = budget_hotels.iloc[0]
+        if budget_idx.size == 0:
+            budget_idx = activity_idx[np.argsort(self.data.activity_cost[activity_idx], kind='stable')[:5]]
 
-        best_hotel = budget_hotels.loc[budget_hotels['review_score'].idxmax()]
-        top_activities = budget_activities.nlargest(5, 'review_score') if 'review_score' in budget_activities.columns else budget_activities.head(5)
+        if self.data.activity_score is not None:
+            budget_idx = budget_idx[np.argsort(-self.data.activity_score[budget_idx], kind='stable')]
+        top_activities = self.data.activity_records[budget_idx[:5]]
 
-        # Create plan
-        plan = f"""
+        # Create plan; sections are collected in a list and joined once at the end
+        parts = [f"""
 # Travel Plan: {origin} → {destination}
 **Dates:** {start_date} to {end_date}
 **Budget:** ${budget}
@@ -199,37 +399,53 @@ class TravelPlanner:
 - Walk Score: {best_hotel['walk_score']} - {best_hotel['notes']}
 
 ## Activities
-"""
+"""]
 
         total_activity_cost = 0
-        for _, activity in top_activities.iterrows():
-            plan += f"- **{activity['name']}** ({activity['theme']})\n"
-            plan += f"  - Duration: {activity['duration_hours']}h - ${activity['cost_usd']}\n"
-            plan += f"  - Hours: {activity['opening_hours']} - {activity['notes']}\n\n"
-            total_activity_cost += activity['cost_usd']
+        for activity in top_activities:
+            parts.append(f"- **{activity.name}** ({activity.theme})\n"
+                         f"  - Duration: {activity.duration_hours}h - ${activity.cost_usd}\n"
+                         f"  - Hours: {activity.opening_hours} - {activity.notes}\n\n")
+            total_activity_cost += activity.cost_usd
 
         total_cost = cheapest_flight['price_usd'] + best_hotel['nightly_price_usd'] * 5 + total_activity_cost
-        plan += f"\n## Total Estimated Cost: ${total_cost:.0f}"
+        parts.append(f"\n## Total Estimated Cost: ${total_cost:.0f}")
 
         if total_cost > budget:
-            plan += f" ⚠️  **OVER BUDGET by ${total_cost - budget:.0f}**"
+            parts.append(f" ⚠️  **OVER BUDGET by ${total_cost - budget:.0f}**")
         else:
-            plan += f" ✅ **Under budget by ${budget - total_cost:.0f}**"
+            parts.append(f" ✅ **Under budget by ${budget - total_cost:.0f}**")
+
+        return "".join(parts)
 
-        return plan
+def _read_csv(path: Path, categories: List[str], text: Tuple[str, ...] = ()) -> pd.DataFrame:
+    """
+    Read a CSV with pyarrow's parser if installed, falling back to pandas.
+    `categories` columns load as categoricals; `text` columns are kept as
+    strings instead of being type-inferred (e.g. HH:MM times).
+    """
+    try:
+        import pyarrow as pa
+        from pyarrow import csv as pa_csv
+    except ImportError:
+        dtype = {col: 'category' for col in categories}
+        dtype.update({col: str for col in text})
+        return pd.read_csv(path, dtype=dtype)
+
+    column_types = {col: pa.dictionary(pa.int32(), pa.string()) for col in categories}
+    column_types.update({col: pa.string() for col in text})
+    table = pa_csv.read_csv(path, convert_options=pa_csv.ConvertOptions(column_types=column_types))
+    return table.to_pandas()
 
 def load_travel_data() -> TravelData:
     """Load travel data from CSV files"""
     try:
-        activities_df = pd.read_csv(DATA_DIR / 'activities.csv')
-        hotels_df = pd.read_csv(DATA_DIR / 'hotels.csv')
-        flights_df = pd.read_csv(DATA_DIR / 'flights.csv')
-
-        return TravelData(
-            activities=activities_df,
-            hotels=hotels_df,
-            flights=flights_df
-        )
+        # Low-cardinality lookup columns are categorical so they compare as integer codes
+        activities_df = _read_csv(DATA_DIR / 'activities.csv', ['city', 'theme'])
+        hotels_df = _read_csv(DATA_DIR / 'hotels.csv', ['city'])
+        flights_df = _read_csv(DATA_DIR / 'flights.csv', ['origin', 'destination'],
+                               text=('depart_time', 'arrive_time'))
+        return TravelData(activities=activities_df, hotels=hotels_df, flights=flights_df)
     except FileNotFoundError as e:
         print(f"Error loading data: {e}")
         print(f"Make sure data files exist in: {DATA_DIR}")
@@ -13,22 +13,27 @@ Usage
 
 Run the script from a terminal with Python 3.9+::
 
-    python personal_expense_tracker.py
+    python personal_expense_tracker.py [FILE]
 
 When the program starts it will automatically attempt to load any existing
-expenses from the default CSV file (``expenses.csv``). If no such file
-exists, the expense list will start empty. Choose actions from the menu by
-entering the corresponding number.
+expenses from the default CSV file (``expenses.csv``), or from the file named
+as the first argument. A name ending in ``.jsonl`` selects the JSON Lines
+format instead of CSV. If the file does not exist, the expense list will
+start empty. Choose actions from the menu by entering the corresponding
+number.
 
 Implementation Notes
 ~~~~~~~~~~~~~~~~~~~~
 
-* Expense entries are stored in a list of dictionaries with the following keys:
-  ``date`` (string, ISO format ``YYYY‑MM‑DD``), ``category`` (string),
-  ``amount`` (float), and ``description`` (string).
+* Expense entries are stored column‑wise in an ``ExpenseStore``: a list of
+  ``description`` strings, a contiguous ``array('d')`` for ``amount``, an
+  ``array('i')`` of dates as days since 1970‑01‑01 and an ``array('I')`` of
+  category ids into a table of distinct category names. Dates are parsed
+  once on entry or load and only formatted back to ``YYYY‑MM‑DD`` for
+  display and saving.
 * Expenses are persisted in a CSV file using Python’s built‑in ``csv`` module.
   When loading, the script will silently skip incomplete rows (missing any
-  required field).
+  required field) and rows whose date or amount cannot be parsed.
 * Basic validation is performed on user input: the date must follow the
   ``YYYY‑MM‑DD`` format and the amount must be a number greater than zero.
   Invalid entries will prompt the user to re‑enter the value.
@@ -41,83 +46,352 @@ Implementation Notes
 from __future__ import annotations
 
 import csv
-import os
+import io
+import math
 import sys
-from datetime import datetime
-from typing import List, Dict
+from array import array
+from datetime import date, datetime
+from itertools import takewhile
+from typing import Dict, Iterable, Iterator, List, Tuple
 
 
-Expense = Dict[str, object]
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
 
-def load_expenses(filename: str) -> List[Expense]:
-    """Load expenses from a CSV file.
 
-    Each row in the file is expected to have four columns: ``date``,
-    ``category``, ``amount``, and ``description``. Rows missing any of these
-    fields will be skipped.
+def _parse_date(date_str: str) -> date:
+    """Parse a ``YYYY‑MM‑DD`` string.
+
+    Zero‑padded dates are split by position, avoiding ``strptime``'s format
+    parsing; anything else (e.g. ``2024-1-5``) falls back to ``strptime``
+    so the accepted inputs are unchanged.
+
+    Raises:
+        ValueError: If ``date_str`` is not a valid date in that format.
+    """
+    if (len(date_str) == 10 and date_str[4] == "-" and date_str[7] == "-"
+            and date_str[:4].isdigit() and date_str[5:7].isdigit() and date_str[8:].isdigit()):
+        return date(int(date_str[:4]), int(date_str[5:7]), int(date_str[8:]))
+    return datetime.strptime(date_str, "%Y-%m-%d").date()
+
+
+def _to_epoch_day(date_str: str) -> int:
+    """Parse a ``YYYY‑MM‑DD`` string to days since 1970‑01‑01.
+
+    Raises:
+        ValueError: If ``date_str`` is not a valid date in that format.
+    """
+    return _parse_date(date_str).toordinal() - _EPOCH_ORDINAL
+
+
+def _from_epoch_day(day: int) -> str:
+    """Format days since 1970‑01‑01 as a ``YYYY‑MM‑DD`` string."""
+    return date.fromordinal(day + _EPOCH_ORDINAL).isoformat()
+
+
+class ExpenseStore:
+    """Column‑oriented container for expenses.
+
+    Each field lives in its own sequence, indexed by row; amounts are kept in
+    an ``array('d')`` of raw doubles rather than as boxed ``float`` objects.
+    ``total`` is the running sum of ``amounts``, kept up to date by
+    :meth:`append`; code that fills the columns directly must call
+    :meth:`recompute_total` afterwards.
+    """
+
+    # Re‑sum after this many incremental additions to bound drift
+    RESUM_EVERY = 1000
+    # Smallest column worth summing with an already imported numpy instead of math.fsum
+    NUMPY_SUM_MIN = 64
+
+    def __init__(self) -> None:
+        self.date_days = array("i")
+        # Categories are dictionary-encoded: each row stores an index into cat_names
+        self.cat_ids = array("I")
+        self.cat_names: List[str] = []
+        self.cat_index: Dict[str, int] = {}
+        self.amounts = array("d")
+        self.descriptions: List[str] = []
+        self.total = 0.0
+        self._adds_since_resum = 0
+        # Two‑decimal strings for a prefix of amounts, filled by amount_strings()
+        self._amount_strs: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.amounts)
+
+    def __iter__(self) -> Iterator[Tuple[str, str, float, str]]:
+        """Yield ``(date, category, amount, description)`` with ISO date strings."""
+        return zip(map(_from_epoch_day, self.date_days), map(self.cat_names.__getitem__, self.cat_ids),
+                   self.amounts, self.descriptions)
+
+    def append(self, day: int, category: str, amount: float, description: str) -> None:
+        """Add one expense (date as days since 1970‑01‑01) to every column."""
+        self.date_days.append(day)
+        self.cat_ids.append(self.category_id(category))
+        self.amounts.append(amount)
+        self.descriptions.append(description)
+        self.total += amount
+        self._adds_since_resum += 1
+        if self._adds_since_resum >= self.RESUM_EVERY:
+            self.recompute_total()
+
+    def extend(self, rows: Iterable[Tuple[int, str, float, str]]) -> None:
+        """Add ``(day, category, amount, description)`` rows, then re‑sum ``total``."""
+        # Plain appends: reserving capacity up front and filling by index, or
+        # transposing rows with zip(*rows), both measured slower.
+        append_day = self.date_days.append
+        append_cat_id = self.cat_ids.append
+        category_id = self.category_id
+        append_amount = self.amounts.append
+        append_description = self.descriptions.append
+        for day, category, amount, description in rows:
+            append_day(day)
+            append_cat_id(category_id(category))
+            append_amount(amount)
+            append_description(description)
+        self.recompute_total()
+
+    def category_id(self, category: str) -> int:
+        """Return the id of ``category``, registering it on first use."""
+        cat_id = self.cat_index.get(category)
+        if cat_id is None:
+            cat_id = self.cat_index[category] = len(self.cat_names)
+            self.cat_names.append(category)
+        return cat_id
+
+    def amount_strings(self) -> List[str]:
+        """Return the amounts formatted with two decimals, as saved to CSV.
+
+        Rows are only ever appended, so formatted amounts are cached and each
+        one is formatted at most once, however often the store is saved.
+        """
+        cache = self._amount_strs
+        if len(cache) < len(self.amounts):
+            cache.extend(map("{:.2f}".format, self.amounts[len(cache):]))
+        return cache
+
+    def recompute_total(self) -> None:
+        """Recompute ``total`` from the amounts column.
+
+        If numpy has already been imported (e.g. when the tracker is used from
+        a notebook), columns of at least ``NUMPY_SUM_MIN`` rows are summed by it
+        straight from the array's buffer. Otherwise the exactly rounded
+        ``math.fsum`` is used: importing numpy just for this costs far more
+        than it saves.
+        """
+        np = sys.modules.get("numpy")
+        if np is not None and len(self.amounts) >= self.NUMPY_SUM_MIN:
+            self.total = float(np.frombuffer(self.amounts, dtype=np.float64).sum())
+        else:
+            self.total = math.fsum(self.amounts)
+        self._adds_since_resum = 0
+
+def iter_expenses(filename: str) -> Iterator[Tuple[int, str, float, str]]:
+    """Yield expenses from a CSV file one row at a time.
+
+    Rows are validated like in :func:`load_expenses`; only the current row
+    (plus the parsed day of each distinct date seen) is held in memory, so
+    large files can be processed without building an ``ExpenseStore``.
 
     Args:
         filename: The path to the CSV file.
 
-    Returns:
-        A list of expense dictionaries.
+    Yields:
+        ``(day, category, amount, description)`` tuples, with ``day`` counted
+        from 1970‑01‑01.
     """
-    expenses: List[Expense] = []
-    if not os.path.isfile(filename):
-        return expenses
+    # Many expenses share a date, so each distinct date string is parsed once
+    days: Dict[str, int] = {}
+    get_day = days.get
     try:
+        # A buffered text file fed to the C csv reader is already faster
+        # than splitting mmap'd lines in Python, so large files use it too.
         with open(filename, newline='', encoding='utf-8') as f:
-            reader = csv.DictReader(f, fieldnames=["date", "category", "amount", "description"])
-            for row in reader:
+            for row in csv.reader(f):
                 # Skip rows with any missing fields
-                if not all(row.get(field) for field in ("date", "category", "amount", "description")):
+                if len(row) < 4 or not (row[0] and row[1] and row[2] and row[3]):
                     continue
-                date_str = row["date"]
-                category = row["category"]
-                amount_str = row["amount"]
-                description = row["description"]
+                date_str, category, amount_str, description = row[:4]
                 try:
                     amount = float(amount_str)
+                    day = get_day(date_str)
+                    if day is None:
+                        day = days[date_str] = _to_epoch_day(date_str)
                 except ValueError:
-                    # Skip rows with non‑numeric amount values
+                    # Skip rows with non‑numeric amounts or invalid dates
                     continue
-                expense: Expense = {
-                    "date": date_str,
-                    "category": category,
-                    "amount": amount,
-                    "description": description,
-                }
-                expenses.append(expense)
+                yield day, category, amount, description
+    except FileNotFoundError:
+        return
     except IOError as exc:
         print(f"Error reading file {filename}: {exc}", file=sys.stderr)
+
+
+def load_expenses(filename: str) -> ExpenseStore:
+    """Load expenses from a CSV file.
+
+    Each row in the file is expected to have four columns: ``date``,
+    ``category``, ``amount``, and ``description``. Rows missing any of these
+    fields will be skipped.
+
+    Rows are streamed from :func:`iter_expenses` into the store.
+
+    A missing file yields an empty store. This is detected by opening the
+    file and catching ``FileNotFoundError`` rather than checking for it
+    first, which saves a ``stat`` call on every start.
+
+    Args:
+        filename: The path to the CSV file.
+
+    Returns:
+        An ``ExpenseStore`` holding the loaded expenses.
+    """
+    expenses = ExpenseStore()
+    expenses.extend(iter_expenses(filename))
     return expenses
 
 
-def save_expenses(filename: str, expenses: List[Expense]) -> None:
+def _needs_quoting(field: str) -> bool:
+    """Return True if ``csv.writer`` would quote ``field``."""
+    return "," in field or '"' in field or "\n" in field or "\r" in field
+
+
+def save_expenses(filename: str, expenses: ExpenseStore) -> None:
     """Save expenses to a CSV file.
 
+    All rows are rendered into an in‑memory buffer that is written to the
+    file in one call. Amounts come pre‑formatted from
+    :meth:`ExpenseStore.amount_strings`. Rows are formatted directly; only rows with a field
+    that needs quoting (a comma, quote or line break) are passed through
+    ``csv.writer``, so the output is identical to writing every row with it.
+
     Args:
         filename: The path to the CSV file.
-        expenses: A list of expense dictionaries to save.
+        expenses: The ``ExpenseStore`` to save.
     """
+    buf = io.StringIO()
+    write = buf.write
+    writer = csv.writer(buf)
+    cat_names = expenses.cat_names
+    # Decided once per distinct category rather than once per row
+    cat_quoted = [_needs_quoting(name) for name in cat_names]
+    for date_str, cat_id, amount_str, description in zip(
+            map(_from_epoch_day, expenses.date_days), expenses.cat_ids,
+            expenses.amount_strings(), expenses.descriptions):
+        # ISO dates never need quoting; the description test is _needs_quoting inlined
+        if (cat_quoted[cat_id] or "," in description or '"' in description
+                or "\n" in description or "\r" in description):
+            writer.writerow([date_str, cat_names[cat_id], amount_str, description])
+        else:
+            write(f"{date_str},{cat_names[cat_id]},{amount_str},{description}\r\n")
     try:
         with open(filename, "w", newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            for exp in expenses:
-                writer.writerow([exp["date"], exp["category"], f"{exp['amount']:.2f}", exp["description"]])
+            f.write(buf.getvalue())
         print(f"Saved {len(expenses)} expense(s) to {filename}.")
     except IOError as exc:
         print(f"Error writing file {filename}: {exc}", file=sys.stderr)
 
 
-def prompt_date() -> str:
-    """Prompt the user for a date in YYYY‑MM‑DD format and validate it."""
+def _json_codec():
+    """Return ``(dumps, loads)`` from orjson when installed, else from ``json``.
+
+    ``dumps`` returns UTF‑8 encoded bytes either way.
+    """
+    try:
+        import orjson
+    except ImportError:
+        import json
+        return (lambda obj: json.dumps(obj, ensure_ascii=False).encode("utf-8")), json.loads
+    return orjson.dumps, orjson.loads
+
+
+def _iter_jsonl_expenses(f, loads) -> Iterator[Tuple[int, str, float, str]]:
+    """Yield validated ``(day, category, amount, description)`` rows from JSON lines."""
+    days: Dict[str, int] = {}
+    get_day = days.get
+    for line in f:
+        try:
+            obj = loads(line)
+            date_str = obj["date"]
+            category = obj["category"]
+            amount = obj["amount"]
+            description = obj["description"]
+            # Skip rows with a missing field or a non‑numeric amount
+            if not (category and description and isinstance(category, str)
+                    and isinstance(description, str)
+                    and isinstance(amount, (int, float)) and not isinstance(amount, bool)):
+                continue
+            amount = float(amount)
+            # orjson cannot read NaN/Infinity, so the json fallback must not accept them either
+            if not math.isfinite(amount):
+                continue
+            day = get_day(date_str)
+            if day is None:
+                day = days[date_str] = _to_epoch_day(date_str)
+        except (ValueError, TypeError, KeyError, OverflowError):
+            # Skip lines that are not JSON objects, have an amount too large
+            # for a float or an invalid date
+            continue
+        yield day, category, amount, description
+
+
+def load_expenses_jsonl(filename: str) -> ExpenseStore:
+    """Load expenses from a JSON Lines file written by :func:`save_expenses_jsonl`.
+
+    Each line is an object with ``date``, ``category``, ``amount`` and
+    ``description`` keys. Amounts are stored as JSON numbers, so finite amounts
+    (the only kind the prompts accept) round‑trip exactly instead of being
+    formatted to two decimals and parsed back as in the CSV format. Lines are
+    skipped under the same rules as CSV rows, and also if they are not valid
+    JSON or the amount is not finite. orjson is used when installed.
+
+    Args:
+        filename: The path to the ``.jsonl`` file.
+
+    Returns:
+        An ``ExpenseStore`` holding the loaded expenses.
+    """
+    _, loads = _json_codec()
+    expenses = ExpenseStore()
+    try:
+        with open(filename, "rb") as f:
+            expenses.extend(_iter_jsonl_expenses(f, loads))
+    except FileNotFoundError:
+        pass
+    except IOError as exc:
+        print(f"Error reading file {filename}: {exc}", file=sys.stderr)
+    return expenses
+
+
+def save_expenses_jsonl(filename: str, expenses: ExpenseStore) -> None:
+    """Save expenses to a JSON Lines file, one object per expense.
+
+    Like :func:`save_expenses`, the whole file is rendered in memory and
+    written in one call.
+
+    Args:
+        filename: The path to the ``.jsonl`` file.
+        expenses: The ``ExpenseStore`` to save.
+    """
+    dumps, _ = _json_codec()
+    data = b"".join(
+        dumps({"date": date_str, "category": category, "amount": amount,
+               "description": description}) + b"\n"
+        for date_str, category, amount, description in expenses)
+    try:
+        with open(filename, "wb") as f:
+            f.write(data)
+        print(f"Saved {len(expenses)} expense(s) to {filename}.")
+    except IOError as exc:
+        print(f"Error writing file {filename}: {exc}", file=sys.stderr)
+
+
+def prompt_date() -> int:
+    """Prompt the user for a date in YYYY‑MM‑DD format and return it as days since 1970‑01‑01."""
     while True:
         date_str = input("Enter the date (YYYY‑MM‑DD): ").strip()
         try:
-            # Validate format by attempting to parse
-            datetime.strptime(date_str, "%Y-%m-%d")
-            return date_str
+            return _to_epoch_day(date_str)
         except ValueError:
             print("Invalid date format. Please use YYYY‑MM‑DD.")
 
@@ -132,12 +406,13 @@ def prompt_category() -> str:
 
 
 def prompt_amount() -> float:
-    """Prompt the user for the amount spent and validate it is a positive number."""
+    """Prompt the user for the amount spent and validate it is a finite, positive number."""
     while True:
         amount_str = input("Enter the amount spent: ").strip()
         try:
             amount = float(amount_str)
-            if amount < 0:
+            # Non‑finite amounts would poison the total and cannot be stored as JSON
+            if amount < 0 or not math.isfinite(amount):
                 raise ValueError
             return amount
         except ValueError:
@@ -148,37 +423,67 @@ def prompt_description() -> str:
     """Prompt the user for a brief description."""
     return input("Enter a brief description: ").strip()
 
-def add_expense(expenses: List[Expense]) -> None:
-    """Add a new expense to the list by prompting the user for details."""
+def add_expense(expenses: ExpenseStore) -> None:
+    """Add a new expense to the store by prompting the user for details."""
     print("\nAdd a New Expense")
-    date_str = prompt_date()
+    day = prompt_date()
     category = prompt_category()
     amount = prompt_amount()
     description = prompt_description()
-    expense: Expense = {
-        "date": date_str,
-        "category": category,
-        "amount": amount,
-        "description": description,
-    }
-    expenses.append(expense)
+    expenses.append(day, category, amount, description)
     print("Expense added successfully.\n")
 
 
-def view_expenses(expenses: List[Expense]) -> None:
+def bulk_add_expenses(expenses: ExpenseStore) -> None:
+    """Add many expenses at once from pasted ``date,category,amount,description`` lines.
+
+    Lines are read from standard input up to the first empty line (or end of
+    input) and parsed together with ``csv.reader``. A line is rejected if its
+    date, category or amount would be refused by the single‑expense prompts;
+    the description may be left out.
+    """
+    print("\nBulk Add Expenses")
+    print("Paste lines as date,category,amount,description; finish with an empty line.")
+    lines = list(takewhile(str.strip, sys.stdin))
+    rows = []
+    skipped = 0
+    for row in csv.reader(lines):
+        if len(row) < 3:
+            skipped += 1
+            continue
+        category = row[1].strip()
+        description = row[3].strip() if len(row) > 3 else ""
+        try:
+            day = _to_epoch_day(row[0].strip())
+            amount = float(row[2])
+        except ValueError:
+            skipped += 1
+            continue
+        if not category or amount < 0 or not math.isfinite(amount):
+            skipped += 1
+            continue
+        rows.append((day, category, amount, description))
+    expenses.extend(rows)
+    print(f"Added {len(rows)} expense(s).")
+    if skipped:
+        print(f"Skipped {skipped} invalid line(s).")
+    print("")
+
+
+def view_expenses(expenses: ExpenseStore) -> None:
     """Display all recorded expenses in a readable format."""
     print("\nRecorded Expenses")
     if not expenses:
         print("No expenses recorded yet.\n")
         return
-    for idx, exp in enumerate(expenses, start=1):
-        print(f"{idx}. Date: {exp['date']} | Category: {exp['category']} | Amount: ${exp['amount']:.2f} | Description: {exp['description']}")
+    for idx, (date_str, category, amount, description) in enumerate(expenses, start=1):
+        print(f"{idx}. Date: {date_str} | Category: {category} | Amount: ${amount:.2f} | Description: {description}")
     print("")
 
 
-def track_budget(expenses: List[Expense], budget: float) -> None:
+def track_budget(expenses: ExpenseStore, budget: float) -> None:
     """Calculate total expenses and compare to the user's budget."""
-    total_spent = sum(exp["amount"] for exp in expenses)
+    total_spent = expenses.total
     print(f"\nTotal spent so far: ${total_spent:.2f}")
     if budget is None:
         print("No budget set for this session.\n")
@@ -212,36 +517,48 @@ def display_menu() -> None:
     print("3. Track budget")
     print("4. Save expenses")
     print("5. Exit")
+    print("6. Bulk add (paste CSV lines, empty line to end)")
 
 
 def main() -> None:
     """Main entry point for the expense tracker program."""
-    FILENAME = "expenses.csv"
-    expenses = load_expenses(FILENAME)
+    FILENAME = sys.argv[1] if len(sys.argv) > 1 else "expenses.csv"
+    if FILENAME.endswith(".jsonl"):
+        load, save = load_expenses_jsonl, save_expenses_jsonl
+    else:
+        load, save = load_expenses, save_expenses
+    expenses = load(FILENAME)
     budget: float | None = None
     if expenses:
         print(f"Loaded {len(expenses)} existing expense(s) from {FILENAME}.\n")
+
+    def track() -> None:
+        nonlocal budget
+        if budget is None:
+            budget = set_budget()
+        track_budget(expenses, budget)
+
+    handlers = {
+        "1": lambda: add_expense(expenses),
+        "2": lambda: view_expenses(expenses),
+        "3": track,
+        "4": lambda: save(FILENAME, expenses),
+        "6": lambda: bulk_add_expenses(expenses),
+    }
     while True:
         display_menu()
-        choice = input("Choose an option (1‑5): ").strip()
-        if choice == "1":
-            add_expense(expenses)
-        elif choice == "2":
-            view_expenses(expenses)
-        elif choice == "3":
-            if budget is None:
-                budget = set_budget()
-            track_budget(expenses, budget)
-        elif choice == "4":
-            save_expenses(FILENAME, expenses)
-        elif choice == "5":
+        choice = input("Choose an option (1‑6): ").strip()
+        if choice == "5":
             # Save before exiting
             if expenses:
-                save_expenses(FILENAME, expenses)
+                save(FILENAME, expenses)
             print("Exiting the program. Goodbye!")
             break
+        handler = handlers.get(choice)
+        if handler is None:
+            print("Invalid option. Please select a number between 1 and 6.\n")
         else:
-            print("Invalid option. Please select a number between 1 and 5.\n")
+            handler()
 
 
 if __name__ == "__main__":